@@ -5,6 +5,7 @@ from ...errors._template import Sim as Error
 from typing import Any, List, Optional, Union, Tuple
 from collections import defaultdict
 import importlib
+import numpy as np
 
 
 class PerfectMeasurements(ABC):
@@ -30,6 +31,9 @@ class PerfectMeasurements(ABC):
     pseudo_qubits : dict of dict
         Nested dictionary of `~.codes.elements.PseudoQubit` objects.
 
+    qubit_coordinates : `~numpy.ndarray`
+        Property with the integer coordinates of all ancilla-qubits and pseudo-qubits as an ``int32`` array of shape ``(3, n)``, with rows ``x``, ``y`` and ``z``. The column of each qubit is stored at ``qubit._idx``.
+
     errors : dict
         Dictionary of error modules with the module name as key. All error modules from :doc:`../errors/index` loaded in ``self.errors`` will be applied during a simulation by :meth:`random_errors`.
 
@@ -71,6 +75,8 @@ class PerfectMeasurements(ABC):
         self.ancilla_qubits = {}
         self.data_qubits = {}
         self.pseudo_qubits = defaultdict(dict)
+        self._coordinates = []
+        self._coordinate_array = np.empty((3, 0), dtype=np.int32)
         self.errors = {}
         self.logical_operators = {}
         self.instance = time.time()
@@ -97,6 +103,13 @@ class PerfectMeasurements(ABC):
         self.prev_logical_state = logical_state
         return logical_state
 
+    @property
+    def qubit_coordinates(self) -> np.ndarray:
+        if self._coordinate_array.shape[1] != len(self._coordinates):
+            self._coordinate_array = np.array(self._coordinates, dtype=np.int32).T.copy()
+            self._coordinate_array.setflags(write=False)
+        return self._coordinate_array
+
     @property
     def trivial_ancillas(self):
         for ancilla in self.ancilla_qubits[self.decode_layer].values():
@@ -205,6 +218,7 @@ class PerfectMeasurements(ABC):
         """Initializes a `~.codes.elements.AncillaQubit` and saved to ``self.ancilla_qubits[z][loc]``."""
         ancilla_qubit = self._AncillaQubit(loc, z, state_type=state_type, **kwargs)
         self.ancilla_qubits[z][loc] = ancilla_qubit
+        self._add_coordinates(ancilla_qubit)
         return ancilla_qubit
 
     def add_pseudo_qubit(
@@ -217,8 +231,14 @@ class PerfectMeasurements(ABC):
         """Initializes a `~.codes.elements.PseudoQubit` and saved to ``self.pseudo_qubits[z][loc]``."""
         pseudo_qubit = self._PseudoQubit(loc, z, state_type=state_type, **kwargs)
         self.pseudo_qubits[z][loc] = pseudo_qubit
+        self._add_coordinates(pseudo_qubit)
         return pseudo_qubit
 
+    def _add_coordinates(self, qubit: Union[AncillaQubit, PseudoQubit]):
+        """Stores the integer coordinates of ``qubit`` for `qubit_coordinates` at its index ``qubit._idx``."""
+        qubit._idx = len(self._coordinates)
+        self._coordinates.append((*qubit._iloc, qubit.z))
+
     @staticmethod
     def entangle_pair(
         data_qubit: DataQubit,
@@ -1,4 +1,5 @@
 from abc import ABC
+from math import floor
 import random
 from typing import Optional, Tuple, Union
 from collections import defaultdict
@@ -21,6 +22,8 @@ class Qubit(ABC):
 
     def __init__(self, loc: Tuple[float, float], z: float = 0, *args, **kwargs):
         self.loc = loc
+        # Floored integer location; differences between qubits of the same type are exact
+        self._iloc = (floor(loc[0]), floor(loc[1]))
         self.z = z
         self.errors = defaultdict(float)
 
@@ -3,6 +3,10 @@ The most popular decoder for surface codes is the Minimum-Weight Perfect Matchin
 
 The decoder defaults to using a Python implementation of MWPM by `networkx.algorithms.matching.max_weight_matching`. This implementation is however quite slow. Optionally, `Blossom V <https://pub.ist.ac.at/~vnk/software.html>`_ [kolmogorov2009]_, a C++ algorithm, can be used to increase the speed of the decoder. Since this software has its own license, it is not bundeled with qsurface. A script is provided to download and compile the latest release of BlossomV in `.get_blossomv`. The interface of the C++ code and Python is taken from `Fault Tolerant Simulations <https://github.com/naominickerson/fault_tolerance_simulations>`_.
 
+If installed, `PyMatching <https://pymatching.readthedocs.io/>`_ can also be used by decoding with ``use_pymatching=True``. The matching graph of the lattice is then constructed once, after which each decode only loads the syndrome into the C++ solver.
+
+Similarly, `rustworkx <https://www.rustworkx.org/>`_ provides a compiled version of the matching algorithm of networkx, which is used by decoding with ``use_rustworkx=True``.
+
 """
 
 from . import sim
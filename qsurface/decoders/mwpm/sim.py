@@ -1,4 +1,4 @@
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 from qsurface.codes.elements import AncillaQubit
 from .._template import Sim
 import networkx as nx
@@ -8,9 +8,91 @@ import os
 import matplotlib.pyplot as plt
 import numpy as np
 from itertools import chain
+from functools import lru_cache
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+try:
+    import pymatching
+except ImportError:
+    pymatching = None
+
+try:
+    import rustworkx
+except ImportError:
+    rustworkx = None
 
 LA = List[AncillaQubit]
 
+# Keys of the two opposite walking directions along x and y, indexed by a boolean instead of branching on it
+WALK_X = ((0.5, 0), (-0.5, 0))
+WALK_Y = ((0, -0.5), (0, 0.5))
+
+
+def _toric_edges(xs, ys, zs, sx, sy):
+    """Computes the toric distances between all pairs of integer coordinates, compiled by `numba` if installed.
+
+    The coordinates are loaded from separate arrays rather than packed into a single ``uint64`` per qubit: the periodic distance needs a modulo per axis, such that packed lanes must be unpacked for each pair anyway.
+    """
+    n = len(xs)
+    m = n * (n - 1) // 2
+    nodes1 = np.empty(m, dtype=np.int32)
+    nodes2 = np.empty(m, dtype=np.int32)
+    weights = np.empty(m, dtype=np.int32)
+    for i0 in range(n - 1):
+        offset = i0 * (2 * n - i0 - 1) // 2
+        for i1 in range(i0 + 1, n):
+            wx = (xs[i0] - xs[i1]) % sx
+            wy = (ys[i0] - ys[i1]) % sy
+            i = offset + i1 - i0 - 1
+            nodes1[i] = i0
+            nodes2[i] = i1
+            weights[i] = min(wx, sx - wx) + min(wy, sy - wy) + abs(zs[i0] - zs[i1])
+    return nodes1, nodes2, weights
+
+
+# The kernel is serial: a parallel kernel starts numba's threading layer, after which processes forked by
+# `~qsurface.main.run_multiprocess` hang, and starting threads costs more than it saves for the few syndromes per decode.
+_toric_edges_numba = njit(fastmath=True)(_toric_edges) if njit is not None else None
+
+
+@lru_cache(maxsize=None)
+def _compile_numba():
+    """Compiles the numba kernel once for the signature used by `.Toric.get_qubit_distances`.
+
+    The kernel is not specialized per lattice size: a size fixed at compile time only saves time beyond some 1000 syndromes, while each new size costs another compilation.
+    """
+    if njit is not None:
+        _toric_edges_numba.compile("(int32[:], int32[:], int32[:], int64, int64)")
+
+
+def _load_pmlib():
+    """Loads the Blossom V library compiled by `.get_blossomv` and sets the argument types of its interface, or returns ``None`` if it is not compiled."""
+    try:
+        PMlib = ctypes.CDLL(os.path.join(os.path.dirname(os.path.abspath(__file__)), "blossom5-v2.05.src", "PMlib.so"))
+    except OSError:
+        return None
+    PMlib.pyMatching.argtypes = [
+        ctypes.c_int,
+        ctypes.c_int,
+        ctypes.POINTER(ctypes.c_int),
+        ctypes.POINTER(ctypes.c_int),
+        ctypes.POINTER(ctypes.c_int),
+    ]
+    return PMlib
+
+
+_PMLIB = _load_pmlib()
+
+
+@lru_cache(maxsize=None)
+def _pm_restype(n: int):
+    """Returns the return type of the Blossom V interface, the array of mates of ``n`` nodes, cached per ``n``."""
+    return ndpointer(dtype=ctypes.c_int, shape=(n,))
+
 
 class Toric(Sim):
     """Minimum-Weight Perfect Matching decoder for the toric lattice.
@@ -33,16 +115,34 @@ class Toric(Sim):
         erasure=True,
     )
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._pymatching = {}
+
     def decode(self, **kwargs):
         # Inherited docstring
+        _compile_numba()
         plaqs, stars = self.get_syndrome()
-        self.correct_matching(plaqs, self.match_syndromes(plaqs, **kwargs))
-        self.correct_matching(stars, self.match_syndromes(stars, **kwargs))
-
-    def match_syndromes(self, syndromes: LA, use_blossomv: bool = False, **kwargs) -> list:
+        layer_qubits = self.get_layer_qubits()
+        self.correct_matching(plaqs, self.match_syndromes(plaqs, **kwargs), *layer_qubits)
+        self.correct_matching(stars, self.match_syndromes(stars, **kwargs), *layer_qubits)
+
+    def get_layer_qubits(self) -> Tuple[dict, dict, Tuple[float, float]]:
+        """Returns the ancilla-qubits and pseudo-qubits of the decode layer, and the size of the code, which are used to apply the corrections."""
+        layer = self.code.decode_layer
+        return self.code.ancilla_qubits[layer], self.code.pseudo_qubits[layer], self.code.size
+
+    def match_syndromes(
+        self,
+        syndromes: LA,
+        use_blossomv: bool = False,
+        use_pymatching: bool = False,
+        use_rustworkx: bool = False,
+        **kwargs,
+    ) -> list:
         """Decodes a list of syndromes of the same type.
 
-        A graph is constructed with the syndromes in ``syndromes`` as nodes and the distances between each of the syndromes as the edges. The distances are dependent on the boundary conditions of the code and is calculated by `get_qubit_distances`. A minimum-weight matching is then found by either `match_networkx` or `match_blossomv`.
+        A graph is constructed with the syndromes in ``syndromes`` as nodes and the distances between each of the syndromes as the edges. The distances are dependent on the boundary conditions of the code and is calculated by `get_qubit_distances`. A minimum-weight matching is then found by either `match_networkx`, `match_rustworkx` or `match_blossomv`. Alternatively, `match_pymatching` finds the matching on the lattice itself.
 
         Parameters
         ----------
@@ -50,6 +150,10 @@ class Toric(Sim):
             Syndromes of the code.
         use_blossomv
             Use external C++ Blossom V library for minimum-weight matching. Needs to be downloaded and compiled by calling `.get_blossomv`.
+        use_pymatching
+            Use `PyMatching <https://pymatching.readthedocs.io/>`_ for minimum-weight matching. Needs to be installed separately.
+        use_rustworkx
+            Use `rustworkx <https://www.rustworkx.org/>`_ for minimum-weight matching. Needs to be installed separately.
 
         Returns
         -------
@@ -57,8 +161,20 @@ class Toric(Sim):
             Minimum-weight matched ancilla-qubits.
 
         """
-        matching_graph = self.match_blossomv if use_blossomv else self.match_networkx
-        edges = self.get_qubit_distances(syndromes, self.code.size)
+        if use_pymatching:
+            return self.match_pymatching(syndromes)
+        if len(syndromes) < 2:
+            return []
+        if len(syndromes) == 2 and self.config["max_cardinality"]:
+            # The only perfect matching of two syndromes on the torus, in the order returned by networkx
+            return [(0, 1)]
+        if use_blossomv:
+            matching_graph = self.match_blossomv
+        elif use_rustworkx:
+            matching_graph = self.match_rustworkx
+        else:
+            matching_graph = self.match_networkx
+        edges = self.get_qubit_distances(syndromes, self.code.size, self.code.qubit_coordinates)
         matching = matching_graph(
             edges,
             maxcardinality=self.config["max_cardinality"],
@@ -67,11 +183,24 @@ class Toric(Sim):
         )
         return matching
 
-    def correct_matching(self, syndromes: LA, matching: list, **kwargs):
-        """Applies the matchings as a correction to the code."""
+    def correct_matching(
+        self,
+        syndromes: LA,
+        matching: list,
+        ancillas: Optional[dict] = None,
+        pseudos: Optional[dict] = None,
+        size: Optional[Tuple[float, float]] = None,
+        **kwargs,
+    ):
+        """Applies the matchings as a correction to the code.
+
+        The ``ancillas``, ``pseudos`` and ``size`` of the decode layer are retrieved by `get_layer_qubits` if not supplied.
+        """
+        if ancillas is None:
+            ancillas, pseudos, size = self.get_layer_qubits()
         weight = 0
         for i0, i1 in matching:
-            weight += self._correct_matched_qubits(syndromes[i0], syndromes[i1])
+            weight += self._correct_matched_qubits(syndromes[i0], syndromes[i1], ancillas, pseudos, size)
         return weight
 
     @staticmethod
@@ -81,7 +210,7 @@ class Toric(Sim):
         Parameters
         ----------
         edges :  [[nodeA, nodeB, distance(nodeA,nodeB)],...]
-            A graph defined by a list of edges.
+            A graph defined by a list or array of edges.
         maxcardinality
             See `networkx.algorithms.matching.max_weight_matching`.
 
@@ -91,8 +220,8 @@ class Toric(Sim):
             Minimum weight matching in the form of [[nodeA, nodeB],..].
         """
         nxgraph = nx.Graph()
-        for i0, i1, weight in edges:
-            nxgraph.add_edge(i0, i1, weight=-weight)
+        # Negated weights, as the maximum-weight matching is found
+        nxgraph.add_weighted_edges_from((np.asarray(edges).reshape(-1, 3) * (1, 1, -1)).tolist())
 
         # # visualize for debugging
         # plt.figure()
@@ -105,6 +234,32 @@ class Toric(Sim):
         return nx.algorithms.matching.max_weight_matching(nxgraph, maxcardinality=maxcardinality)
         # return nx.algorithms.matching.min_weight_matching(nxgraph, maxcardinality=maxcardinality)
 
+    @staticmethod
+    def match_rustworkx(edges: list, maxcardinality: float, **kwargs) -> set:
+        """Finds the minimum-weight matching of a list of ``edges`` using `rustworkx.max_weight_matching`.
+
+        The compiled matching of `rustworkx <https://www.rustworkx.org/>`_ finds a matching of the same weight as `match_networkx`, but may select another matching between equal-weight alternatives.
+
+        Parameters
+        ----------
+        edges :  [[nodeA, nodeB, distance(nodeA,nodeB)],...]
+            A graph defined by a list or array of edges.
+        maxcardinality
+            See `rustworkx.max_weight_matching`.
+
+        Returns
+        -------
+        set
+            Minimum weight matching in the form of {(nodeA, nodeB),..}.
+        """
+        if rustworkx is None:
+            raise ImportError("rustworkx not installed. See docs.")
+        graph = rustworkx.PyGraph()
+        # Negated weights, as the maximum-weight matching is found
+        nodes0, nodes1, weights = (np.asarray(edges).reshape(-1, 3) * (1, 1, -1)).T.tolist()
+        graph.extend_from_weighted_edge_list(list(zip(nodes0, nodes1, weights)))
+        return rustworkx.max_weight_matching(graph, max_cardinality=maxcardinality, weight_fn=int)
+
     @staticmethod
     def match_blossomv(edges: list, num_nodes: float = 0, **kwargs) -> list:
         """Finds the minimum-weight matching of a list of ``edges`` using `Blossom V <https://pub.ist.ac.at/~vnk/software.html>`_.
@@ -112,7 +267,7 @@ class Toric(Sim):
         Parameters
         ----------
         edges : [[nodeA, nodeB, distance(nodeA,nodeB)],...]
-            A graph defined by a list of edges.
+            A graph defined by a list or array of edges.
 
         Returns
         -------
@@ -120,62 +275,152 @@ class Toric(Sim):
             Minimum weight matching in the form of [[nodeA, nodeB],..].
         """
 
+        global _PMLIB
         if num_nodes == 0:
             return []
-        try:
-            folder = os.path.dirname(os.path.abspath(__file__))
-            PMlib = ctypes.CDLL(folder + "/blossom5-v2.05.src/PMlib.so")
-        except:
-            raise FileNotFoundError("Blossom5 library not found. See docs.")
-
-        PMlib.pyMatching.argtypes = [
-            ctypes.c_int,
-            ctypes.c_int,
-            ctypes.POINTER(ctypes.c_int),
-            ctypes.POINTER(ctypes.c_int),
-            ctypes.POINTER(ctypes.c_int),
-        ]
-        PMlib.pyMatching.restype = ndpointer(dtype=ctypes.c_int, shape=(num_nodes,))
-
-        # initialize ctypes array and fill with edge data
-        numEdges = len(edges)
-        nodes1 = (ctypes.c_int * numEdges)()
-        nodes2 = (ctypes.c_int * numEdges)()
-        weights = (ctypes.c_int * numEdges)()
-
-        for i in range(numEdges):
-            nodes1[i] = edges[i][0]
-            nodes2[i] = edges[i][1]
-            weights[i] = edges[i][2]
-
-        matching = PMlib.pyMatching(ctypes.c_int(num_nodes), ctypes.c_int(numEdges), nodes1, nodes2, weights)
-        return [[i0, i1] for i0, i1 in enumerate(matching) if i0 > i1]
+        if _PMLIB is None:
+            # The library may have been compiled by `.get_blossomv` after this module was imported
+            _PMLIB = _load_pmlib()
+            if _PMLIB is None:
+                raise FileNotFoundError("Blossom5 library not found. See docs.")
+        _PMLIB.pyMatching.restype = _pm_restype(num_nodes)
+
+        # Copy edge data into one contiguous buffer, of which each row is passed as a C array
+        columns = np.ascontiguousarray(np.asarray(edges).reshape(-1, 3).T, dtype=ctypes.c_int)
+        numEdges = columns.shape[1]
+        nodes1, nodes2, weights = (column.ctypes.data_as(ctypes.POINTER(ctypes.c_int)) for column in columns)
+
+        # Blossom V returns the mate of each node; each pair is kept once from its larger node
+        mates = _PMLIB.pyMatching(ctypes.c_int(num_nodes), ctypes.c_int(numEdges), nodes1, nodes2, weights).tolist()
+        return [[i0, i1] for i0, i1 in enumerate(mates) if i0 > i1]
+
+    def match_pymatching(self, syndromes: LA, **kwargs) -> list:
+        """Finds the minimum-weight matching of a list of ``syndromes`` using `PyMatching <https://pymatching.readthedocs.io/>`_.
+
+        Instead of the fully connected graph between the syndromes, PyMatching solves the matching on the graph of the lattice, which is constructed only once per syndrome type by `get_pymatching`. Each call only loads the syndromes into the solver.
+
+        Parameters
+        ----------
+        syndromes
+            Syndromes of the code.
+
+        Returns
+        -------
+        list
+            Minimum weight matching in the form of [[nodeA, nodeB],..].
+        """
+        if not syndromes:
+            return []
+        return self._match_pymatching(syndromes).tolist()
+
+    def _match_pymatching(self, ancillas: LA) -> np.ndarray:
+        """Returns the PyMatching pairs of indices of ``ancillas``, where index -1 is the boundary."""
+        matching, index = self.get_pymatching(ancillas[0].state_type)
+        detectors = np.fromiter((index[ancilla] for ancilla in ancillas), dtype=np.int64, count=len(ancillas))
+        syndrome = np.zeros(len(index), dtype=np.uint8)
+        syndrome[detectors] = 1
+        pairs = matching.decode_to_matched_dets_array(syndrome)
+
+        # The extra last element maps the boundary detector -1 to -1
+        positions = np.full(len(index) + 1, -1, dtype=np.int64)
+        positions[detectors] = np.arange(len(ancillas))
+        return positions[pairs]
+
+    def get_pymatching(self, state_type: str):
+        """Returns the PyMatching graph of the lattice for syndromes of ``state_type`` and the node index of each ancilla-qubit.
+
+        Every ancilla-qubit of ``state_type`` in all layers is a node, connected with unit weight to its neighbors in the lattice and in time. Edges to pseudo-qubits are added as boundary edges. The graph is constructed once and stored per ``state_type``.
+        """
+        if pymatching is None:
+            raise ImportError("PyMatching not installed. See docs.")
+        if state_type not in self._pymatching:
+            ancillas = [
+                ancilla
+                for layer in self.code.ancilla_qubits.values()
+                for ancilla in layer.values()
+                if ancilla.state_type == state_type
+            ]
+            index = {ancilla: i for i, ancilla in enumerate(ancillas)}
+            matching = pymatching.Matching()
+            for ancilla in ancillas:
+                for neighbor, _ in self.get_neighbors(ancilla).values():
+                    if neighbor not in index:
+                        matching.add_boundary_edge(index[ancilla], merge_strategy="smallest-weight")
+                    elif index[neighbor] > index[ancilla]:
+                        matching.add_edge(index[ancilla], index[neighbor], merge_strategy="smallest-weight")
+            self._pymatching[state_type] = matching, index
+        return self._pymatching[state_type]
 
     @staticmethod
-    def get_qubit_distances(qubits: LA, size: Tuple[float, float]):
+    def get_qubit_distances(
+        qubits: LA, size: Tuple[float, float], coordinates: Optional[np.ndarray] = None
+    ) -> np.ndarray:
         """Computes the distance between a list of qubits.
 
-        On a toric lattice, the shortest distance between two qubits may be one in four directions due to the periodic boundary conditions. The ``size`` parameters indicates the length in both x and y directions to find the shortest distance in all directions.
+        On a toric lattice, the shortest distance between two qubits may be one in four directions due to the periodic boundary conditions. The ``size`` parameters indicates the length in both x and y directions to find the shortest distance in all directions. If `numba <https://numba.pydata.org/>`_ is installed, the distances are computed by a compiled kernel, otherwise with NumPy.
+
+        Parameters
+        ----------
+        qubits
+            Qubits to compute the distances between.
+        size
+            Size of the code.
+        coordinates
+            The `~.codes._template.sim.PerfectMeasurements.qubit_coordinates` of the code, from which the coordinates of ``qubits`` are gathered by their indices. If not supplied, the coordinates are read from each qubit.
+
+        Returns
+        -------
+        `~numpy.ndarray`
+            Array of ``int32`` edges of shape ``(m, 3)``, where each row is ``[nodeA, nodeB, distance(nodeA,nodeB)]``.
         """
-        edges = []
-        for i0, q0 in enumerate(qubits[:-1]):
-            (x0, y0), z0 = q0.loc, q0.z
-            for i1, q1 in enumerate(qubits[i0 + 1 :]):
-                (x1, y1), z1 = q1.loc, q1.z
-                wx = int(x0 - x1) % (size[0])
-                wy = int(y0 - y1) % (size[1])
-                wz = int(abs(z0 - z1))
-                weight = min([wy, size[1] - wy]) + min([wx, size[0] - wx]) + wz
-                edges.append([i0, i1 + i0 + 1, weight])
-        return edges
+        n = len(qubits)
+        if coordinates is not None:
+            xs, ys, zs = coordinates[:, np.fromiter((q._idx for q in qubits), dtype=np.intp, count=n)]
+        else:
+            xs = np.fromiter((q._iloc[0] for q in qubits), dtype=np.int32, count=n)
+            ys = np.fromiter((q._iloc[1] for q in qubits), dtype=np.int32, count=n)
+            zs = np.fromiter((q.z for q in qubits), dtype=np.int32, count=n)
+        sx, sy = int(size[0]), int(size[1])
+
+        if _toric_edges_numba is not None:
+            return np.column_stack(_toric_edges_numba(xs, ys, zs, sx, sy))
+        return Toric._toric_edges_numpy(xs, ys, zs, sx, sy)
 
-    def _correct_matched_qubits(self, aq0: AncillaQubit, aq1: AncillaQubit) -> float:
+    @staticmethod
+    def _toric_edges_numpy(xs: np.ndarray, ys: np.ndarray, zs: np.ndarray, sx: int, sy: int) -> np.ndarray:
+        """Computes the toric distances between all pairs of integer coordinates with NumPy."""
+        iu, ju = Toric._pair_indices(len(xs))
+        dx = (xs[iu] - xs[ju]) % sx
+        dy = (ys[iu] - ys[ju]) % sy
+        wz = np.abs(zs[iu] - zs[ju])
+        return np.column_stack([iu, ju, Toric._toric_weight_table(sx, sy)[dx, dy] + wz]).astype(np.int32)
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _pair_indices(n: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns the (read-only) indices of all node pairs ``i0 < i1`` among ``n`` nodes, cached per ``n``."""
+        indices = np.triu_indices(n, 1)
+        for index in indices:
+            index.setflags(write=False)
+        return indices
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _toric_weight_table(sx: int, sy: int) -> np.ndarray:
+        """Returns the (read-only) table of toric distances indexed by ``(dx % sx, dy % sy)``, cached per size."""
+        wx = np.minimum(np.arange(sx), sx - np.arange(sx))
+        wy = np.minimum(np.arange(sy), sy - np.arange(sy))
+        table = (wx[:, None] + wy[None, :]).astype(np.int16)
+        table.setflags(write=False)
+        return table
+
+    def _correct_matched_qubits(
+        self, aq0: AncillaQubit, aq1: AncillaQubit, ancillas: dict, pseudos: dict, size: Tuple[float, float]
+    ) -> float:
         """Flips the values of edges between two matched qubits by doing a walk in between."""
-        ancillas = self.code.ancilla_qubits[self.code.decode_layer]
-        pseudos = self.code.pseudo_qubits[self.code.decode_layer]
         dq0 = ancillas[aq0.loc] if aq0.loc in ancillas else pseudos[aq0.loc]
         dq1 = ancillas[aq1.loc] if aq1.loc in ancillas else pseudos[aq1.loc]
-        dx, dy, xd, yd = self._walk_direction(aq0, aq1, self.code.size)
+        dx, dy, xd, yd = self._walk_direction(aq0, aq1, size)
         xv = self._walk_and_correct(dq0, dy, yd)
         self._walk_and_correct(dq1, dx, xd)
         return dy + dx + abs(aq0.z - aq1.z)
@@ -183,15 +428,13 @@ class Toric(Sim):
     @staticmethod
     def _walk_direction(q0: AncillaQubit, q1: AncillaQubit, size: Tuple[float, float]):
         """Finds the closest walking distance and direction."""
-        (x0, y0) = q0.loc
-        (x1, y1) = q1.loc
-        dx0 = int(x0 - x1) % size[0]
-        dx1 = int(x1 - x0) % size[0]
-        dy0 = int(y0 - y1) % size[1]
-        dy1 = int(y1 - y0) % size[1]
-        dx, xd = (dx0, (0.5, 0)) if dx0 < dx1 else (dx1, (-0.5, 0))
-        dy, yd = (dy0, (0, -0.5)) if dy0 < dy1 else (dy1, (0, 0.5))
-        return dx, dy, xd, yd
+        (x0, y0) = q0._iloc
+        (x1, y1) = q1._iloc
+        sx, sy = size
+        dx, dy = (x0 - x1) % sx, (y0 - y1) % sy
+        # The walk in the opposite direction is shorter if it is past half the size
+        ix, iy = 2 * dx >= sx, 2 * dy >= sy
+        return (dx, sx - dx)[ix], (dy, sy - dy)[iy], WALK_X[ix], WALK_Y[iy]
 
     def _walk_and_correct(self, qubit: AncillaQubit, length: float, key: str):
         """Corrects the state of a qubit as it traversed during a walk."""
@@ -212,8 +455,9 @@ class Planar(Toric):
     def decode(self, **kwargs):
         # Inherited docstring
         plaqs, stars = self.get_syndrome(find_pseudo=True)
-        weight = self.correct_matching(plaqs, self.match_syndromes(plaqs, **kwargs))
-        # self.correct_matching(stars, self.match_syndromes(stars, **kwargs))
+        layer_qubits = self.get_layer_qubits()
+        weight = self.correct_matching(plaqs, self.match_syndromes(plaqs, **kwargs), *layer_qubits)
+        # self.correct_matching(stars, self.match_syndromes(stars, **kwargs), *layer_qubits)
 
         p = self.code.error_rates['p_bitflip']
         phi = self.calc_phi()# + weight*np.log(p / (1 - p))
@@ -229,6 +473,16 @@ class Planar(Toric):
         return wy + wx + wz
 
     def calc_phi(self):
+        p = self.code.error_rates['p_bitflip']
+        w = -np.log(p / (1 - p))
+        if not len(self.matching):
+            # Without matched syndromes all lattice edges have weight w, and the shortest path between both sides is a row
+            # of size[0] edges. The weights are added in order, as in the Dijkstra search, to return the same float.
+            length = 0
+            for _ in range(self.code.size[0]):
+                length += w
+            return length
+
         # Part 1: getting the edges
         values = self.code.data_qubits.values()
         inner_values = [inner_dict.values() for inner_dict in values]
@@ -238,6 +492,7 @@ class Planar(Toric):
         G = nx.Graph()
 
         boundary_nodes = set()
+        lattice_edges = []
         for edge in edges:
             if edge.state_type == 'x':
                 # collect boundary nodes
@@ -246,9 +501,9 @@ class Planar(Toric):
                 if edge.nodes[1].qubit_type == 'pA':
                     boundary_nodes.add(edge.nodes[1])
 
-                # actually add the edge
-                p = self.code.error_rates['p_bitflip']
-                G.add_edge(edge.nodes[0], edge.nodes[1], weight=-np.log(p / (1 - p)))
+                lattice_edges.append((edge.nodes[0], edge.nodes[1], w))
+        # actually add the edges
+        G.add_weighted_edges_from(lattice_edges)
 
         # if in the matching and both are not boundary nodes, give it weight 0
         # print('-----------')
@@ -256,36 +511,28 @@ class Planar(Toric):
         # print(self.code.pseudo_qubits)
         # print(self.matching)
         # print('self.ancillas_matchingind', self.ancillas_matchingind)
+        # coordinates of the nodes of all edges, computed once for all matched pairs
+        nodes = [node for edge in edges for node in edge.nodes]
+        coordinates = self.code.qubit_coordinates
+        bx, by, bz = coordinates[:, np.fromiter((node._idx for node in nodes), dtype=np.intp, count=len(nodes))]
+
         for node0, node1 in self.matching:
             if self.boundary_info[node0] == '' or self.boundary_info[node1] == '':
                 edge_weight = self.get_weight(self.ancillas_matchingind[node0], self.ancillas_matchingind[node1])
-                for dq_edge in edges:
-                    for a in [node0, node1]:
-                        for b in dq_edge.nodes:
-                            if self.get_weight(self.ancillas_matchingind[a], b) < edge_weight/2:
-                                G.add_edge(self.ancillas_matchingind[a], b, weight=0)
+                for a in [node0, node1]:
+                    qubit = self.ancillas_matchingind[a]
+                    ax, ay, az = coordinates[:, qubit._idx]
+                    weights = np.abs(bx - ax) + np.abs(by - ay) + np.abs(bz - az)
+                    G.add_weighted_edges_from((qubit, nodes[i], 0) for i in np.flatnonzero(weights < edge_weight / 2))
 
         # connect boundary nodes on the same side into 1 node
-        for elem1 in boundary_nodes:
-            for elem2 in boundary_nodes:
-                if elem1 != elem2:
-                    # if vertical, change loc[0] to loc[1]
-                    if (elem1.loc[0] == 0 and elem2.loc[0] == 0) or (elem1.loc[0] != 0 and elem2.loc[0] != 0):
-                        G.add_edge(elem1, elem2, weight=0)
-                        if elem1.loc[0] != 0 and elem2.loc[0] != 0:
-                            assert(elem1.loc[0] == self.code.size[0] and elem2.loc[0] == self.code.size[0])
-                        assert (elem1.loc[0] == elem2.loc[0])  # they should be the same nonzero value, probably d tbh
-
-        # call dijkstras
-        # get s & t nodes
-        for elem in boundary_nodes:
-            # arbitrarily pick one to be the
-            if elem.loc[0] == 0 and elem.loc[1] == 0:
-                s = elem
-            elif elem.loc[1] == 0:
-                t = elem
-        length, path = nx.single_source_dijkstra(G, s, t)
-        # print(length, path)
+        # if vertical, change loc[0] to loc[1]
+        G.add_weighted_edges_from((node, "S_L" if node.loc[0] == 0 else "S_R", 0) for node in boundary_nodes)
+
+        # call dijkstras between both sides
+        s, t = "S_L", "S_R"
+        length = nx.dijkstra_path_length(G, s, t)
+        # print(length)
 
         # # visualize for debugging
         # plt.figure()
@@ -297,10 +544,17 @@ class Planar(Toric):
 
         return length
 
-    def match_syndromes(self, syndromes: LA, use_blossomv: bool = False, **kwargs) -> list:
+    def match_syndromes(
+        self,
+        syndromes: LA,
+        use_blossomv: bool = False,
+        use_pymatching: bool = False,
+        use_rustworkx: bool = False,
+        **kwargs,
+    ) -> list:
         """Decodes a list of syndromes of the same type.
 
-        A graph is constructed with the syndromes in ``syndromes`` as nodes and the distances between each of the syndromes as the edges. The distances are dependent on the boundary conditions of the code and is calculated by `get_qubit_distances`. A minimum-weight matching is then found by either `match_networkx` or `match_blossomv`.
+        A graph is constructed with the syndromes in ``syndromes`` as nodes and the distances between each of the syndromes as the edges. The distances are dependent on the boundary conditions of the code and is calculated by `get_qubit_distances`. A minimum-weight matching is then found by either `match_networkx`, `match_rustworkx` or `match_blossomv`. Alternatively, `match_pymatching` finds the matching on the lattice itself.
 
         Parameters
         ----------
@@ -308,6 +562,10 @@ class Planar(Toric):
             Syndromes of the code.
         use_blossomv
             Use external C++ Blossom V library for minimum-weight matching. Needs to be downloaded and compiled by calling `.get_blossomv`.
+        use_pymatching
+            Use `PyMatching <https://pymatching.readthedocs.io/>`_ for minimum-weight matching. Needs to be installed separately.
+        use_rustworkx
+            Use `rustworkx <https://www.rustworkx.org/>`_ for minimum-weight matching. Needs to be installed separately.
 
         Returns
         -------
@@ -315,77 +573,109 @@ class Planar(Toric):
             Minimum-weight matched ancilla-qubits.
 
         """
-        matching_graph = self.match_blossomv if use_blossomv else self.match_networkx
+        if use_pymatching:
+            self.matching = self.match_pymatching(syndromes)
+            return self.matching
+        if not syndromes or (len(syndromes) == 1 and self.config["max_cardinality"]):
+            # No syndrome is left unmatched, or a single syndrome is matched to its own pseudo-qubit
+            self._set_matching_nodes(syndromes)
+            self.matching = [(0, 1)] if syndromes else []
+            return self.matching
+        if use_blossomv:
+            matching_graph = self.match_blossomv
+        elif use_rustworkx:
+            matching_graph = self.match_rustworkx
+        else:
+            matching_graph = self.match_networkx
         self.edges = self.get_qubit_distances(syndromes, self.code.size)
         self.matching = matching_graph(
             self.edges,
             maxcardinality=self.config["max_cardinality"],
-            num_nodes=len(syndromes),
+            num_nodes=2 * len(syndromes),
             **kwargs,
         )
 
         return self.matching
 
 
-    def correct_matching(self, syndromes: List[Tuple[AncillaQubit, AncillaQubit]], matching: list):
+    def correct_matching(
+        self,
+        syndromes: List[Tuple[AncillaQubit, AncillaQubit]],
+        matching: list,
+        ancillas: Optional[dict] = None,
+        pseudos: Optional[dict] = None,
+        size: Optional[Tuple[float, float]] = None,
+        **kwargs,
+    ):
         # Inherited docstring
+        if ancillas is None:
+            ancillas, pseudos, size = self.get_layer_qubits()
+        n = len(syndromes)
         weight = 0
         for i0, i1 in matching:
-            if i0 < len(syndromes) or i1 < len(syndromes):
-                aq0 = syndromes[i0][0] if i0 < len(syndromes) else syndromes[i0 - len(syndromes)][1]
-                aq1 = syndromes[i1][0] if i1 < len(syndromes) else syndromes[i1 - len(syndromes)][1]
-                weight += self._correct_matched_qubits(aq0, aq1)
+            if i0 < n or i1 < n:
+                aq0 = syndromes[i0][0] if i0 < n else syndromes[i0 - n][1]
+                aq1 = syndromes[i1][0] if i1 < n else syndromes[i1 - n][1]
+                weight += self._correct_matched_qubits(aq0, aq1, ancillas, pseudos, size)
         return weight
 
-    def get_qubit_distances(self, qubits, *args):
+    def get_qubit_distances(self, qubits, *args) -> np.ndarray:
         """Computes the distance between a list of qubits.
 
         On a planar lattice, any qubit can be paired with the boundary, which is inhabited by `~.codes.elements.PseudoQubit` objects. The graph of syndromes that supports minimum-weight matching algorithms must be fully connected, with each syndrome connecting additionally to its boundary pseudo-qubit, and a fully connected graph between all pseudo-qubits with weight 0.
         """
-        edges = []
-        self.boundary_info = [''] * (2*len(qubits)) # index = node #, value = L or R
-        self.ancillas_matchingind = [None] * (2*len(qubits))
-        # if len(qubits) == 1:
-        #     print('qubits', qubits)
+        n = len(qubits)
+        self._set_matching_nodes(qubits)
+        x, y, z = self.matching_coordinates
+        ax, ay, az, px, py = x[:n], y[:n], z[:n], x[n:], y[n:]
+        x_type = np.fromiter((a.state_type == "x" for a, _ in qubits), dtype=bool, count=n)
+
         # Add edges between all ancilla-qubits
-        for i0, (a0, _) in enumerate(qubits):
-            (x0, y0), z0 = a0.loc, a0.z
-            self.ancillas_matchingind[i0] = a0
-            for i1, (a1, _) in enumerate(qubits[i0 + 1 :], start=i0 + 1):
-                (x1, y1), z1 = a1.loc, a1.z
-                wx = int(abs(x0 - x1))
-                wy = int(abs(y0 - y1))
-                wz = int(abs(z0 - z1))
-                weight = wy + wx + wz
-                edges.append([i0, i1, weight])
-                self.ancillas_matchingind[i1] = a1
+        iu, ju = self._pair_indices(n)
+        weights = np.abs(ax[iu] - ax[ju]) + np.abs(ay[iu] - ay[ju]) + np.abs(az[iu] - az[ju])
+        ancilla_edges = np.column_stack([iu, ju, weights])
 
         # Add edges between ancilla-qubits and their boundary pseudo-qubits
-        for i, (ancilla, pseudo) in enumerate(qubits):
-            (xs, ys) = ancilla.loc
-            (xb, yb) = pseudo.loc
-            weight = xb - xs if ancilla.state_type == "x" else yb - ys
-            edges.append([i, len(qubits) + i, int(abs(weight))])
-            if xb == 0:
-                self.boundary_info[len(qubits) + i] = 'L'
-            else:
-                self.boundary_info[len(qubits) + i] = 'R'
-            self.ancillas_matchingind[len(qubits) + i] = pseudo
-
-        # self.m = pymatching.Matching()
-        # self.m.set_boundary_nodes(set(range(len(qubits), 2*len(qubits))))
+        nodes = np.arange(n)
+        weights = np.abs(np.where(x_type, px - ax, py - ay))
+        boundary_edges = np.column_stack([nodes, nodes + n, weights])
 
         # Add edges of weight 0 between all pseudo-qubits
-        for i0 in range(len(qubits), 2*len(qubits)):
-            for i1 in range(i0 + 1, 2*len(qubits)):
-                edges.append([i0, i1, 0])
+        return np.concatenate([ancilla_edges, boundary_edges, self._zero_clique(n)]).astype(np.int32)
+
+    def _set_matching_nodes(self, qubits: List[Tuple[AncillaQubit, AncillaQubit]]):
+        """Stores the qubit, coordinates and boundary side of each node in the matching graph of ``qubits``, used by `get_qubit_distances` and `calc_phi`."""
+        n = len(qubits)
+        self.ancillas_matchingind = [ancilla for ancilla, _ in qubits] + [pseudo for _, pseudo in qubits]
+        nodes = np.fromiter((qubit._idx for qubit in self.ancillas_matchingind), dtype=np.intp, count=2 * n)
+        self.matching_coordinates = self.code.qubit_coordinates[:, nodes]
+        # index = node #, value = L or R
+        self.boundary_info = np.concatenate([np.full(n, ""), np.where(self.matching_coordinates[0, n:] == 0, "L", "R")])
+
+    def match_pymatching(self, syndromes: List[Tuple[AncillaQubit, AncillaQubit]], **kwargs) -> list:
+        # Inherited docstring
+        n = len(syndromes)
+        self._set_matching_nodes(syndromes)
+        if n == 0:
+            return []
+        pairs = self._match_pymatching([ancilla for ancilla, _ in syndromes])
+
+        # Syndromes matched to the boundary are paired with their own pseudo-qubit at node n + i
+        return np.where(pairs == -1, pairs[:, ::-1] + n, pairs).tolist()
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _zero_clique(n: int) -> np.ndarray:
+        """Returns the (read-only) edges of weight 0 between the pseudo-qubit nodes ``n, ..., 2n-1``, cached per ``n``."""
+        iu, ju = Toric._pair_indices(n)
+        edges = np.zeros((len(iu), 3), dtype=np.int32)
+        edges[:, 0], edges[:, 1] = iu + n, ju + n
+        edges.setflags(write=False)
         return edges
 
     @staticmethod
     def _walk_direction(q0, q1, *args):
         # Inherited docsting
-        (x0, y0), (x1, y1) = q0.loc, q1.loc
-        dx, dy = int(x0 - x1), int(y0 - y1)
-        xd = (0.5, 0) if dx > 0 else (-0.5, 0)
-        yd = (0, -0.5) if dy > 0 else (0, 0.5)
-        return abs(dx), abs(dy), xd, yd
+        (x0, y0), (x1, y1) = q0._iloc, q1._iloc
+        dx, dy = x0 - x1, y0 - y1
+        return abs(dx), abs(dy), WALK_X[dx <= 0], WALK_Y[dy <= 0]
@@ -34,6 +34,11 @@ setup(
         "scipy>=1.4.0",
         "pptree>=3.1",
     ],
+    extras_require={
+        "numba": ["numba>=0.50"],
+        "pymatching": ["pymatching>=2.1"],
+        "rustworkx": ["rustworkx>=0.13"],
+    },
     entry_points={
         "console_scrips": [
             "qsurface=qsurface.__main__:main",
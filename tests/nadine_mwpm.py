@@ -1,73 +1,107 @@
+from concurrent.futures import ProcessPoolExecutor
 from qsurface.main import *
 from tests.variables import *
 import time
-from collections import defaultdict
 import json
 from datetime import datetime
 import cProfile
+import random
 import re
 import numpy as np
 
 ds = [7]#, 41, 51, 61, 71, 81, 91, 101] #5, 7, 9, 11, 13, 15, 17, 19, 21
 ps = [1e-6]
 itera = 1000000
+chunk = 10000
+workers = None # defaults to os.cpu_count()
 faulty = True
 saving = True
 
 times = []
 
-while True:
-
-    for d in ds:
-        code, decoder = initialize(
-            d, #size = 5 is d = 5
-            "planar",
-            "unionfind",
-            enabled_errors=["pauli"],
-            faulty_measurements=faulty,
-            initial_states=(0, 0),
-            plotting=False,
-            # plot_params=no_wait_param,
-            step_bucket=False,
-            step_cluster=True,
-            step_cycle=False,
-            step_peel=False,
-            mp_queue=True
-        )
-        for p in ps:
-            start = time.time()
-            final_dict_failure = defaultdict(int) # stores how many times each one is correct
-            final_dict_nofailure = defaultdict(int) # stores how many times each one is correct
-
-            # run it
-            # t2 = time.time()
-            for i in range(itera):
-                output = run(code, decoder, iterations=1, error_rates={"p_bitflip": p, "p_bitflip_plaq": p})
-                if output['no_error'] == 1:
-                    final_dict_nofailure[output['phi']] += 1
-                elif output['no_error'] == 0:
-                    final_dict_failure[output['phi']] += 1
-            # t3 = time.time()
-            # times.append(t3-t2)
-            # print(f'each {itera} iteration', np.average(times))
-
-            end = time.time()
-            print('total time elapsed ', (end - start)/60 , ' min')
-
-            print('FINAL no failure dict: \n', final_dict_nofailure)
-            print('FINAL failure dict: \n', final_dict_failure)
-
-            # save it
-            if saving:
-                json_str = json.dumps(final_dict_nofailure)
-                timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-                file_name = f"data_actualfaultymeas/d{d}_nofailure_p_{p}_faulty_{faulty}_num{itera}_{timestamp}.txt"
-                file_name2 = f"data_actualfaultymeas/d{d}_failure_p_{p}_faulty_{faulty}_num{itera}_{timestamp}.txt"
-                with open(file_name, "w") as file:
-                    file.write(json_str)
-
-                json_str2 = json.dumps(final_dict_failure)
-                with open(file_name2, "w") as file:
-                    file.write(json_str2)
+
+def counts_to_dict(counts, log_ratio):
+    """Converts counts indexed by path length k back to a dictionary keyed by phi = k * log((1-p)/p)."""
+    return {k * log_ratio: int(count) for k, count in enumerate(counts) if count}
+
+
+def _worker(n_iters, d, p, seed):
+    """Runs ``n_iters`` decode trials on its own code instance and returns the (no failure, failure) counts per path length.
+
+    Every trial is seeded from a generator seeded with ``seed``, such that workers with distinct seeds draw uncorrelated errors.
+    """
+    code, decoder = initialize(
+        d, #size = 5 is d = 5
+        "planar",
+        "unionfind",
+        enabled_errors=["pauli"],
+        faulty_measurements=faulty,
+        initial_states=(0, 0),
+        plotting=False,
+        # plot_params=no_wait_param,
+        step_bucket=False,
+        step_cluster=True,
+        step_cycle=False,
+        step_peel=False,
+        mp_queue=True
+    )
+    error_rates = {"p_bitflip": p, "p_bitflip_plaq": p}
+    code.error_rates = error_rates # read by calc_phi during the initial decode of run
+    rng = random.Random(seed)
+    # phi is an integer path length k times log((1-p)/p), with 0 <= k <= d
+    log_ratio = np.log((1 - p) / p)
+    counts_failure = np.zeros(d + 1, dtype=np.int64) # stores how many times each one is correct
+    counts_nofailure = np.zeros(d + 1, dtype=np.int64) # stores how many times each one is correct
+    for i in range(n_iters):
+        output = run(code, decoder, iterations=1, error_rates=error_rates, seed=rng.random())
+        k = int(round(output['phi'] / log_ratio))
+        if output['no_error'] == 1:
+            counts_nofailure[k] += 1
+        elif output['no_error'] == 0:
+            counts_failure[k] += 1
+    return counts_nofailure, counts_failure
+
+
+if __name__ == "__main__":
+    while True:
+
+        for d in ds:
+            for p in ps:
+                start = time.time()
+                log_ratio = np.log((1 - p) / p)
+                counts_failure = np.zeros(d + 1, dtype=np.int64)
+                counts_nofailure = np.zeros(d + 1, dtype=np.int64)
+
+                # run it in chunks of independent trials, each chunk with its own seed
+                base_seed = random.randrange(2**32)
+                sizes = [min(chunk, itera - i) for i in range(0, itera, chunk)]
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    futures = [pool.submit(_worker, n, d, p, base_seed + i) for i, n in enumerate(sizes)]
+                    for future in futures:
+                        nofailure, failure = future.result()
+                        counts_nofailure += nofailure
+                        counts_failure += failure
+
+                end = time.time()
+                print('total time elapsed ', (end - start)/60 , ' min')
+
+                final_dict_nofailure = counts_to_dict(counts_nofailure, log_ratio)
+                final_dict_failure = counts_to_dict(counts_failure, log_ratio)
+
+                print('FINAL no failure dict: \n', final_dict_nofailure)
+                print('FINAL failure dict: \n', final_dict_failure)
+
+                # save it
+                if saving:
+                    json_str = json.dumps(final_dict_nofailure)
+                    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+                    file_name = f"data_actualfaultymeas/d{d}_nofailure_p_{p}_faulty_{faulty}_num{itera}_{timestamp}.txt"
+                    file_name2 = f"data_actualfaultymeas/d{d}_failure_p_{p}_faulty_{faulty}_num{itera}_{timestamp}.txt"
+                    with open(file_name, "w") as file:
+                        file.write(json_str)
+
+                    json_str2 = json.dumps(final_dict_failure)
+                    with open(file_name2, "w") as file:
+                        file.write(json_str2)
 
 
@@ -2,6 +2,7 @@ from qsurface.main import *
 import qsurface as oss
 import pytest
 import random
+import numpy as np
 from .variables import *
 
 
@@ -15,6 +16,59 @@ def test_get_blossomv():
     assert matching == [[1, 0], [3, 2]]
 
 
+def test_toric_qubit_distances():
+    code = oss.codes.toric.sim.PerfectMeasurements(4)
+    code.initialize("pauli")
+    ancillas = code.ancilla_qubits[code.decode_layer]
+    qubits = [ancillas[(0, 0)], ancillas[(3, 0)], ancillas[(1, 2)]]
+    for coordinates in [None, code.qubit_coordinates]:
+        edges = oss.decoders.mwpm.sim.Toric.get_qubit_distances(qubits, code.size, coordinates)
+        assert edges.tolist() == [[0, 1, 1], [0, 2, 3], [1, 2, 4]]
+
+
+def test_planar_single_syndrome():
+    code = oss.codes.planar.sim.PerfectMeasurements(5)
+    code.initialize("pauli", initial_states=(0, 0))
+    code.error_rates = {"p_bitflip": 0.1}
+    decoder = oss.decoders.mwpm.sim.Planar(code)
+    code.data_qubits[code.decode_layer][(0.5, 0)].edges["x"].state = True
+    code.random_errors(p_bitflip=0)
+
+    syndromes = decoder.get_syndrome(find_pseudo=True)[0]
+    assert len(syndromes) == 1
+    edges = decoder.get_qubit_distances(syndromes)
+    assert decoder.match_syndromes(syndromes) == list(decoder.match_networkx(edges, maxcardinality=True))
+
+    decoder.decode()
+    assert code.trivial_ancillas
+    assert code.logical_state == {"x": 0, "z": 0}
+
+
+def test_match_rustworkx():
+    pytest.importorskip("rustworkx")
+    edges = np.array([[0, 1, 2], [0, 2, 1], [0, 3, 3], [1, 2, 1], [1, 3, 3], [2, 3, 2]])
+    weights = {(i0, i1): weight for i0, i1, weight in edges.tolist()}
+    matchings = [
+        match(edges, maxcardinality=True)
+        for match in [oss.decoders.mwpm.sim.Toric.match_networkx, oss.decoders.mwpm.sim.Toric.match_rustworkx]
+    ]
+    assert len(matchings[0]) == len(matchings[1]) == 2
+    weight = [sum(weights[min(pair), max(pair)] for pair in matching) for matching in matchings]
+    assert weight[0] == weight[1]
+
+
+def test_toric_edges_numba():
+    pytest.importorskip("numba")
+    sim = oss.decoders.mwpm.sim
+    rng = np.random.default_rng(0)
+    xs, ys, zs = (rng.integers(0, 7, 20).astype(np.int32) for _ in range(3))
+    edges = sim.Toric._toric_edges_numpy(xs, ys, zs, 7, 7)
+    for kernel in [sim._toric_edges, sim._toric_edges_numba]:
+        numba_edges = np.column_stack(kernel(xs, ys, zs, 7, 7))
+        assert numba_edges.dtype == edges.dtype
+        assert (numba_edges == edges).all()
+
+
 @pytest.mark.parametrize("Code", CODES)
 @pytest.mark.parametrize("errors", get_error_combinations())
 @pytest.mark.parametrize(
@@ -48,3 +102,23 @@ def test_decoder_pm(size, Code, errors, faulty, max_rate, extra_keys):
 
     else:
         assert True
+
+
+@pytest.mark.parametrize("faulty, size, max_rate", [(False, SIZE_PM, 0.2), (True, SIZE_FM, 0.05)])
+def test_decoder_pymatching(faulty, size, max_rate):
+    pytest.importorskip("pymatching")
+    Code_module = oss.codes.toric.sim
+    code = Code_module.FaultyMeasurements(size) if faulty else Code_module.PerfectMeasurements(size)
+    code.initialize("pauli")
+    decoder = oss.decoders.mwpm.sim.Toric(code)
+
+    trivial = 0
+    for _ in range(ITERS):
+        error_rates = {"p_bitflip": random.random() * max_rate}
+        if faulty:
+            error_rates["pm_bitflip"] = random.random() * max_rate
+        code.random_errors(**error_rates)
+        decoder.decode(use_pymatching=True)
+        trivial += code.trivial_ancillas
+
+    assert trivial == ITERS